@@ -1,14 +1,17 @@
 import os
-import json
+import atexit
+import sqlite3
+import uuid
+import orjson
 from typing import Annotated, TypedDict, Sequence
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
-from langgraph.checkpoint.memory import MemorySaver
-from langchain_core.messages import BaseMessage, ToolMessage, HumanMessage
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langchain_core.messages import BaseMessage, ToolMessage, HumanMessage, SystemMessage
 from langchain_core.tools import tool
+from langchain_core.runnables.config import ContextThreadPoolExecutor
 from langchain_openai import ChatOpenAI
 from langchain_community.tools.tavily_search import TavilySearchResults
-import yfinance as yf
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -29,6 +32,9 @@ search_tool = TavilySearchResults(max_results=3)
 @tool
 def get_stock_price(symbol: str) -> str:
     """Get current stock price."""
+    # Imported lazily: yfinance pulls in pandas/numpy, which search-only sessions never need.
+    # The first price lookup pays that import cost; later calls reuse sys.modules.
+    import yfinance as yf
     ticker = yf.Ticker(symbol)
     price = ticker.history(period="1d")["Close"].iloc[-1]
     return f"{symbol}: ${price:.2f}"
@@ -39,14 +45,19 @@ print(f"✅ Tools ready: {list(tools_by_name.keys())}")
 
 # Model
 model = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+model_with_tools = model.bind_tools(tools)
 print("🤖 Model initialized")
 
+# Static system prompt kept first so the provider can reuse the cached prefix
+SYSTEM_PROMPT = SystemMessage(
+    content="You are a helpful research assistant. Use tools for searches/stock. Reason step-by-step."
+)
+
 # Nodes
 def agent_node(state: AgentState):
     print("\n📝 [AGENT] LLM reasoning...")
-    system = "You are a helpful research assistant. Use tools for searches/stock. Reason step-by-step."
-    messages = [system] + state["messages"]
-    response = model.bind_tools(tools).invoke(messages)
+    messages = [SYSTEM_PROMPT] + state["messages"]
+    response = model_with_tools.invoke(messages)
     print(f"   → Agent response: {response.content[:100]}...")
     if response.tool_calls:
         print(f"   → Will call {len(response.tool_calls)} tools")
@@ -58,9 +69,20 @@ def tools_node(state: AgentState):
     last_msg = state["messages"][-1]
     for i, tool_call in enumerate(last_msg.tool_calls):
         print(f"   → Tool {i+1}: {tool_call['name']}({tool_call['args']})")
-        tool_result = tools_by_name[tool_call["name"]].invoke(tool_call["args"])
+    # Tools are network-bound, so run parallel tool calls concurrently
+    # ContextThreadPoolExecutor copies contextvars so tool runs stay in the graph's trace
+    with ContextThreadPoolExecutor(max_workers=len(last_msg.tool_calls) or 1) as pool:
+        results = list(pool.map(
+            lambda tc: tools_by_name[tc["name"]].invoke(tc["args"]),
+            last_msg.tool_calls
+        ))
+    for tool_call, tool_result in zip(last_msg.tool_calls, results):
+        if isinstance(tool_result, str):
+            content = tool_result
+        else:
+            content = orjson.dumps(tool_result).decode()
         tool_msg = ToolMessage(
-            content=json.dumps(tool_result),
+            content=content,
             name=tool_call["name"],
             tool_call_id=tool_call["id"]
         )
@@ -84,13 +106,21 @@ workflow.set_entry_point("agent")
 workflow.add_conditional_edges("agent", should_continue, {"tools": "tools", END: END})
 workflow.add_edge("tools", "agent")
 
-memory = MemorySaver()
+# Checkpoints persist across runs; override the location with FINANCEBUDDY_CHECKPOINT_DB
+checkpoint_db = os.getenv(
+    "FINANCEBUDDY_CHECKPOINT_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "checkpoints.db")
+)
+checkpoint_conn = sqlite3.connect(checkpoint_db, check_same_thread=False)
+atexit.register(checkpoint_conn.close)
+memory = SqliteSaver(checkpoint_conn)
 app = workflow.compile(checkpointer=memory, interrupt_before=["tools"])
 print("✅ Graph compiled with HITL interrupt")
 
 # Test Main
 if __name__ == "__main__":
-    config = {"configurable": {"thread_id": "test_thread"}}
+    # Fresh thread per run: checkpoints persist, so a fixed id would resume old history
+    config = {"configurable": {"thread_id": f"test_thread_{uuid.uuid4().hex[:8]}"}}
     print(f"\n🎯 Using thread: {config['configurable']['thread_id']}")
     
     # Step 1: Initial query